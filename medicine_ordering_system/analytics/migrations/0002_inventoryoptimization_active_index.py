@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventoryoptimization',
+            index=models.Index(fields=['medicine', 'is_active', '-calculated_at'], name='analytics_i_medicin_25fba9_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:42
+
+import numpy as np
+from django.db import migrations, models
+
+
+def pack_forecasted_demand(apps, schema_editor):
+    DemandForecast = apps.get_model('analytics', 'DemandForecast')
+    forecasts = []
+    for forecast in DemandForecast.objects.only('id', 'forecasted_demand').iterator():
+        forecast.forecasted_demand_bin = np.asarray(forecast.forecasted_demand, dtype=np.float32).tobytes()
+        forecasts.append(forecast)
+    DemandForecast.objects.bulk_update(forecasts, ['forecasted_demand_bin'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_inventoryoptimization_active_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='demandforecast',
+            name='forecasted_demand_bin',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_forecasted_demand, migrations.RunPython.noop),
+    ]
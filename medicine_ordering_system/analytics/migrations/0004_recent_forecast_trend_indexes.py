@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_demandforecast_forecasted_demand_bin'),
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='demandforecast',
+            index=models.Index(fields=['medicine', 'is_active', '-created_at'], name='analytics_d_medicin_d75089_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salestrend',
+            index=models.Index(fields=['-period_date'], name='analytics_s_period__c7c9fb_idx'),
+        ),
+    ]
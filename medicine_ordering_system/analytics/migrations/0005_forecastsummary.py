@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+
+def build_forecast_summaries(apps, schema_editor):
+    DemandForecast = apps.get_model('analytics', 'DemandForecast')
+    ForecastSummary = apps.get_model('analytics', 'ForecastSummary')
+    rows = DemandForecast.objects.filter(is_active=True).annotate(
+        day=TruncDate('created_at')
+    ).values('medicine_id', 'forecast_period', 'day').annotate(
+        forecast_count=Count('id'),
+        sum_mape=Sum('mape'),
+        sum_rmse=Sum('rmse'),
+        sum_mae=Sum('mae'),
+        sum_aic=Sum('aic'),
+        sum_bic=Sum('bic'),
+        excellent_models=Count('id', filter=Q(mape__lt=10)),
+        good_models=Count('id', filter=Q(mape__gte=10, mape__lt=20)),
+        fair_models=Count('id', filter=Q(mape__gte=20, mape__lt=30)),
+        poor_models=Count('id', filter=Q(mape__gte=30)),
+    ).order_by()
+    ForecastSummary.objects.bulk_create([ForecastSummary(**row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_recent_forecast_trend_indexes'),
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForecastSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('forecast_period', models.CharField(max_length=20)),
+                ('day', models.DateField()),
+                ('forecast_count', models.PositiveIntegerField(default=0)),
+                ('sum_mape', models.FloatField(default=0.0)),
+                ('sum_rmse', models.FloatField(default=0.0)),
+                ('sum_mae', models.FloatField(default=0.0)),
+                ('sum_aic', models.FloatField(default=0.0)),
+                ('sum_bic', models.FloatField(default=0.0)),
+                ('excellent_models', models.PositiveIntegerField(default=0)),
+                ('good_models', models.PositiveIntegerField(default=0)),
+                ('fair_models', models.PositiveIntegerField(default=0)),
+                ('poor_models', models.PositiveIntegerField(default=0)),
+                ('medicine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='forecast_summaries', to='inventory.medicine')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['-day'], name='analytics_f_day_85024e_idx')],
+                'unique_together': {('medicine', 'forecast_period', 'day')},
+            },
+        ),
+        migrations.RunPython(build_forecast_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_forecastsummary'),
+        ('inventory', '0002_medicine_low_stock_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='demandforecast',
+            index=models.Index(fields=['is_active', '-created_at'], name='analytics_d_is_acti_2bf7fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='demandforecast',
+            index=models.Index(fields=['medicine', 'aic'], name='analytics_d_medicin_036a02_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='demandforecast',
+            index=models.Index(fields=['mape'], name='analytics_d_mape_338481_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='demandforecast',
+            index=models.Index(fields=['forecast_period', 'mape'], name='analytics_d_forecas_789fca_idx'),
+        ),
+    ]
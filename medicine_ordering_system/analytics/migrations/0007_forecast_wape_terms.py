@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_forecast_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='demandforecast',
+            name='sum_abs_err',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='demandforecast',
+            name='sum_actual',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='forecastsummary',
+            name='sum_abs_err',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='forecastsummary',
+            name='sum_actual',
+            field=models.FloatField(default=0.0),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:20
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+
+def clear_non_finite_criteria(apps, schema_editor):
+    DemandForecast = apps.get_model('analytics', 'DemandForecast')
+    ForecastSummary = apps.get_model('analytics', 'ForecastSummary')
+
+    non_finite = [float('inf'), float('-inf')]
+    DemandForecast.objects.filter(Q(aic__in=non_finite) | Q(bic__in=non_finite)).update(aic=None, bic=None)
+
+    # Same grouping as ForecastSummary.refresh, only the AIC/BIC columns are rebuilt
+    rows = DemandForecast.objects.filter(is_active=True).annotate(day=TruncDate('created_at')).values(
+        'medicine_id', 'forecast_period', 'day'
+    ).annotate(
+        ic_count=Count('aic'),
+        sum_aic=Sum('aic', default=0.0),
+        sum_bic=Sum('bic', default=0.0),
+    ).order_by()
+    for row in rows.iterator():
+        ForecastSummary.objects.filter(
+            medicine_id=row['medicine_id'], forecast_period=row['forecast_period'], day=row['day']
+        ).update(ic_count=row['ic_count'], sum_aic=row['sum_aic'], sum_bic=row['sum_bic'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_forecast_wape_terms'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='demandforecast',
+            name='aic',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='demandforecast',
+            name='bic',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='forecastsummary',
+            name='ic_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(clear_non_finite_criteria, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, Exists, F, FloatField, OuterRef, Q, Sum, When
+from django.db.models.functions import TruncDate
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
+import numpy as np
 
 
 class DemandForecast(models.Model):
@@ -23,14 +26,17 @@ class DemandForecast(models.Model):
     arima_q = models.PositiveIntegerField()  # moving average order
     
     # Model evaluation metrics
-    aic = models.FloatField()  # Akaike Information Criterion
-    bic = models.FloatField()  # Bayesian Information Criterion
+    aic = models.FloatField(null=True, blank=True)  # Akaike Information Criterion, None when not finite
+    bic = models.FloatField(null=True, blank=True)  # Bayesian Information Criterion, None when not finite
     rmse = models.FloatField()  # Root Mean Square Error
     mae = models.FloatField()   # Mean Absolute Error
     mape = models.FloatField()  # Mean Absolute Percentage Error
+    sum_abs_err = models.FloatField(null=True, blank=True)  # sum of absolute errors over the fitted periods
+    sum_actual = models.FloatField(null=True, blank=True)  # sum of actual demand over the fitted periods
     
     # Forecast results
     forecasted_demand = models.JSONField()  # array of forecasted values
+    forecasted_demand_bin = models.BinaryField(null=True, blank=True, editable=False)  # float32 copy of forecasted_demand
     confidence_intervals = models.JSONField()  # upper and lower bounds
     
     # Historical data used for training
@@ -47,24 +53,160 @@ class DemandForecast(models.Model):
         indexes = [
             models.Index(fields=['medicine', 'forecast_period']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['medicine', 'is_active', '-created_at']),
+            models.Index(fields=['is_active', '-created_at']),
+            models.Index(fields=['medicine', 'aic']),
+            models.Index(fields=['mape']),
+            models.Index(fields=['forecast_period', 'mape']),
         ]
     
     def __str__(self):
         return f"Demand Forecast for {self.medicine.name} - {self.forecast_period}"
     
+    # save() and delete() keep ForecastSummary current. Queryset update()/delete(),
+    # bulk_create() and cascades from Medicine bypass them, callers of those must
+    # run ForecastSummary.refresh() for the affected medicines themselves
+    def save(self, *args, **kwargs):
+        if 'forecasted_demand' not in self.get_deferred_fields():
+            self.pack_forecasted_demand()
+        super().save(*args, **kwargs)
+        ForecastSummary.refresh([self.medicine_id])
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        ForecastSummary.refresh([self.medicine_id])
+        return result
+    
+    def pack_forecasted_demand(self):
+        """Store forecasted_demand as float32 bytes alongside the JSON list"""
+        if self.forecasted_demand is not None:
+            self.forecasted_demand_bin = np.asarray(self.forecasted_demand, dtype=np.float32).tobytes()
+    
+    @property
+    def forecasted_demand_array(self):
+        """Forecasted values as a float32 array, read from the binary copy when available"""
+        if self.forecasted_demand_bin:
+            return np.frombuffer(self.forecasted_demand_bin, dtype=np.float32)
+        return np.asarray(self.forecasted_demand, dtype=np.float32)
+    
+    @property
+    def wape(self):
+        """Weighted Absolute Percentage Error, None when it was not recorded or demand was zero"""
+        if self.sum_abs_err is None or not self.sum_actual:
+            return None
+        return self.sum_abs_err / self.sum_actual * 100
+    
+    @property
+    def quality_error(self):
+        """Error used to rate the model, WAPE with MAPE as fallback for older forecasts"""
+        wape = self.wape
+        return self.mape if wape is None else wape
+    
     @property
     def model_quality(self):
         """Determine model quality based on metrics"""
-        if self.mape < 10:
+        error = self.quality_error
+        if error < 10:
             return "Excellent"
-        elif self.mape < 20:
+        elif error < 20:
             return "Good"
-        elif self.mape < 30:
+        elif error < 30:
             return "Fair"
         else:
             return "Poor"
 
 
+class ForecastSummary(models.Model):
+    """
+    Daily rollup of active demand forecast metrics per medicine and forecast period
+    """
+    medicine = models.ForeignKey('inventory.Medicine', on_delete=models.CASCADE, related_name='forecast_summaries')
+    forecast_period = models.CharField(max_length=20)
+    day = models.DateField()
+    
+    # Metric sums, divide by forecast_count for averages (by ic_count for AIC/BIC)
+    forecast_count = models.PositiveIntegerField(default=0)
+    ic_count = models.PositiveIntegerField(default=0)  # forecasts with a finite AIC/BIC
+    sum_mape = models.FloatField(default=0.0)
+    sum_rmse = models.FloatField(default=0.0)
+    sum_mae = models.FloatField(default=0.0)
+    sum_aic = models.FloatField(default=0.0)
+    sum_bic = models.FloatField(default=0.0)
+    sum_abs_err = models.FloatField(default=0.0)
+    sum_actual = models.FloatField(default=0.0)
+    
+    # Forecast counts by model quality (see DemandForecast.model_quality)
+    excellent_models = models.PositiveIntegerField(default=0)
+    good_models = models.PositiveIntegerField(default=0)
+    fair_models = models.PositiveIntegerField(default=0)
+    poor_models = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['medicine', 'forecast_period', 'day']
+        ordering = ['-day']
+        indexes = [
+            models.Index(fields=['-day']),
+        ]
+    
+    def __str__(self):
+        return f"Forecast Summary - {self.medicine_id} - {self.forecast_period} - {self.day}"
+    
+    @classmethod
+    def refresh(cls, medicine_ids=None):
+        """Rebuild the rollup rows of the given medicines (all when None) from their active forecasts"""
+        forecasts = DemandForecast.objects.filter(is_active=True)
+        summaries = cls.objects.all()
+        if medicine_ids is not None:
+            forecasts = forecasts.filter(medicine_id__in=medicine_ids)
+            summaries = summaries.filter(medicine_id__in=medicine_ids)
+        
+        # Same rule as DemandForecast.quality_error, evaluated in the database
+        quality_error = Case(
+            When(sum_abs_err__isnull=False, sum_actual__gt=0, then=F('sum_abs_err') * 100.0 / F('sum_actual')),
+            default=F('mape'),
+            output_field=FloatField(),
+        )
+        metrics = {
+            'forecast_count': Count('id'),
+            'sum_mape': Sum('mape'),
+            'sum_rmse': Sum('rmse'),
+            'sum_mae': Sum('mae'),
+            'ic_count': Count('aic'),
+            'sum_aic': Sum('aic', default=0.0),
+            'sum_bic': Sum('bic', default=0.0),
+            'sum_abs_err': Sum('sum_abs_err', default=0.0),
+            'sum_actual': Sum('sum_actual', default=0.0),
+            'excellent_models': Count('id', filter=Q(quality_error__lt=10)),
+            'good_models': Count('id', filter=Q(quality_error__gte=10, quality_error__lt=20)),
+            'fair_models': Count('id', filter=Q(quality_error__gte=20, quality_error__lt=30)),
+            'poor_models': Count('id', filter=Q(quality_error__gte=30)),
+        }
+        rows = forecasts.annotate(day=TruncDate('created_at'), quality_error=quality_error).values(
+            'medicine_id', 'forecast_period', 'day'
+        ).annotate(**metrics).order_by()
+        
+        # Days that no longer have an active forecast
+        stale = summaries.filter(~Exists(
+            forecasts.annotate(day=TruncDate('created_at')).filter(
+                medicine_id=OuterRef('medicine_id'),
+                forecast_period=OuterRef('forecast_period'),
+                day=OuterRef('day'),
+            )
+        ))
+        
+        with transaction.atomic():
+            # Upsert rather than delete and reinsert, so concurrent refreshes of a medicine
+            # cannot both insert the same (medicine, forecast_period, day) row
+            cls.objects.bulk_create(
+                [cls(**row) for row in rows.iterator(chunk_size=2000)],
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['medicine', 'forecast_period', 'day'],
+                update_fields=list(metrics),
+            )
+            stale.delete()
+
+
 class InventoryOptimization(models.Model):
     """
     Optimal inventory levels based on demand forecasting
@@ -99,6 +241,9 @@ class InventoryOptimization(models.Model):
     
     class Meta:
         ordering = ['-calculated_at']
+        indexes = [
+            models.Index(fields=['medicine', 'is_active', '-calculated_at']),
+        ]
     
     def __str__(self):
         return f"Inventory Optimization for {self.medicine.name}"
@@ -139,6 +284,7 @@ class SalesTrend(models.Model):
         ordering = ['-period_date']
         indexes = [
             models.Index(fields=['medicine', 'period_type', 'period_date']),
+            models.Index(fields=['-period_date']),
         ]
     
     def __str__(self):
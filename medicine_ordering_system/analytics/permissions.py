@@ -0,0 +1,12 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsAdminOrPharmacistAdmin(BasePermission):
+    """
+    Allow access only to authenticated admins and pharmacist admins
+    """
+    message = 'Permission denied'
+    
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and user.can_view_analytics)
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+
+PERIOD_TYPE_CHOICES = ['daily', 'weekly', 'monthly']
+
+
+class SalesTrendsQuerySerializer(serializers.Serializer):
+    """
+    Query parameters for the sales trends endpoint
+    """
+    period_type = serializers.ChoiceField(choices=PERIOD_TYPE_CHOICES, default='weekly')
+    days_back = serializers.IntegerField(default=90, min_value=1, max_value=3650)
+
+
+class SystemMetricsQuerySerializer(serializers.Serializer):
+    """
+    Query parameters for the system metrics endpoint
+    """
+    period_type = serializers.ChoiceField(choices=PERIOD_TYPE_CHOICES, default='daily')
+    days_back = serializers.IntegerField(default=30, min_value=1, max_value=3650)
@@ -0,0 +1,29 @@
+"""
+Celery tasks for running ARIMA forecasting outside the request cycle
+"""
+
+from celery import shared_task
+
+from .services import get_forecasting_service
+
+
+@shared_task
+def generate_forecast_task(medicine_id, forecast_period='weekly', forecast_horizon=4):
+    """
+    Generate a demand forecast and its inventory optimization, returning the forecast id
+    """
+    forecasting_service = get_forecasting_service()
+    forecast = forecasting_service.generate_forecast(medicine_id, forecast_period, forecast_horizon)
+    forecasting_service.optimize_inventory_levels(forecast)
+    return forecast.id
+
+
+@shared_task
+def generate_bulk_forecasts_task(medicine_ids, forecast_period='weekly', forecast_horizon=4):
+    """
+    Generate forecasts and inventory optimizations for several medicines, returning the forecast ids
+    """
+    forecasts = get_forecasting_service().generate_bulk_forecasts(
+        medicine_ids, forecast_period, forecast_horizon
+    )
+    return [forecast.id for forecast in forecasts]
@@ -13,6 +13,7 @@ urlpatterns = [
     
     # API endpoints
     path('api/forecast/generate/', api_views.generate_forecast, name='api_generate_forecast'),
+    path('api/forecast/task/<str:task_id>/', api_views.get_forecast_task_status, name='api_forecast_task_status'),
     path('api/forecast/<int:forecast_id>/data/', api_views.get_forecast_data, name='api_forecast_data'),
     path('api/forecast/bulk/', api_views.generate_bulk_forecasts, name='api_bulk_forecasts'),
     path('api/sales-trends/<int:medicine_id>/', api_views.get_sales_trends, name='api_sales_trends'),
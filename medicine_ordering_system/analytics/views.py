@@ -6,8 +6,10 @@ from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 from django.db import models
-from django.db.models import Q, Sum, Count
+from django.db.models import F, Q, Sum, Count, Window
+from django.db.models.functions import Coalesce, NullIf, Round, RowNumber
 from django.core.paginator import Paginator
+from django.core.cache import cache
 from django.utils import timezone
 from django.contrib import messages
 from datetime import datetime, timedelta
@@ -30,8 +32,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from .models import DemandForecast, InventoryOptimization, SalesTrend, CustomerAnalytics, SystemMetrics
-from .services import ARIMAForecastingService, SupplyChainOptimizer
+from .models import DemandForecast, ForecastSummary, InventoryOptimization, SalesTrend, CustomerAnalytics, SystemMetrics
+from .services import get_forecasting_service
 from .step_analysis import generate_step_analysis
 from inventory.models import Medicine, Category
 from orders.models import Order, OrderItem
@@ -68,13 +70,15 @@ class AnalyticsDashboardView(TemplateView):
         # Recent forecasts
         recent_forecasts = DemandForecast.objects.filter(
             is_active=True
+        ).select_related('medicine').only(
+            'id', 'forecast_period', 'mape', 'is_active', 'created_at', 'medicine__name'
         ).order_by('-created_at')[:10]
         
         # Low stock medicines
         low_stock_medicines = Medicine.objects.filter(
             current_stock__lte=models.F('reorder_point'),
             is_active=True
-        )[:10]
+        ).only('id', 'name', 'current_stock', 'reorder_point')[:10]
         
         # Recent sales trends
         recent_trends = SalesTrend.objects.filter(
@@ -132,102 +136,77 @@ class ModelEvaluationView(TemplateView):
         # Get all forecasts with their metrics
         forecasts = DemandForecast.objects.filter(is_active=True).order_by('-created_at')
         
-        # Calculate aggregate metrics
-        context.update(self._calculate_aggregate_metrics(forecasts))
+        # Aggregates only change with the forecasts themselves (and the day, for the daily chart)
+        forecasting_service = get_forecasting_service()
+        version = forecasting_service.get_forecasts_version()
+        context.update(cache.get_or_set(
+            f"model_eval:aggregates:{timezone.localdate().isoformat()}:{version}",
+            lambda: {
+                **self._calculate_aggregate_metrics(ForecastSummary.objects.all()),
+                **self._get_model_performance_distribution(ForecastSummary.objects.all()),
+            },
+            forecasting_service.cache_timeout
+        ))
         
         # Get recent forecasts for detailed view
-        context['recent_forecasts'] = forecasts[:20]
-        
-        # Get model performance distribution
-        context.update(self._get_model_performance_distribution(forecasts))
+        context['recent_forecasts'] = forecasts.select_related('medicine').only(
+            'id', 'forecast_period', 'created_at', 'mape', 'sum_abs_err', 'sum_actual',
+            'rmse', 'mae', 'aic', 'bic', 'medicine__name'
+        )[:20]
         
         # Get medicine-specific performance
         context.update(self._get_medicine_performance(forecasts))
         
         return context
     
-    def _calculate_aggregate_metrics(self, forecasts):
+    def _calculate_aggregate_metrics(self, summaries):
         """Calculate aggregate model performance metrics"""
-        if not forecasts.exists():
-            return {
-                'total_forecasts': 0,
-                'avg_mape': 0,
-                'avg_rmse': 0,
-                'avg_mae': 0,
-                'avg_aic': 0,
-                'avg_bic': 0,
-                'excellent_models': 0,
-                'good_models': 0,
-                'fair_models': 0,
-                'poor_models': 0,
-            }
-        
-        # Calculate averages
-        avg_mape = forecasts.aggregate(avg=models.Avg('mape'))['avg'] or 0
-        avg_rmse = forecasts.aggregate(avg=models.Avg('rmse'))['avg'] or 0
-        avg_mae = forecasts.aggregate(avg=models.Avg('mae'))['avg'] or 0
-        avg_aic = forecasts.aggregate(avg=models.Avg('aic'))['avg'] or 0
-        avg_bic = forecasts.aggregate(avg=models.Avg('bic'))['avg'] or 0
-        
-        # Count by quality
-        excellent_models = forecasts.filter(mape__lt=10).count()
-        good_models = forecasts.filter(mape__gte=10, mape__lt=20).count()
-        fair_models = forecasts.filter(mape__gte=20, mape__lt=30).count()
-        poor_models = forecasts.filter(mape__gte=30).count()
-        
-        return {
-            'total_forecasts': forecasts.count(),
-            'avg_mape': round(avg_mape, 2),
-            'avg_rmse': round(avg_rmse, 2),
-            'avg_mae': round(avg_mae, 2),
-            'avg_aic': round(avg_aic, 2),
-            'avg_bic': round(avg_bic, 2),
-            'excellent_models': excellent_models,
-            'good_models': good_models,
-            'fair_models': fair_models,
-            'poor_models': poor_models,
-        }
+        # Every average and quality bucket from the pre-aggregated rollup rows,
+        # rounded and defaulted to 0 by the database.
+        # WAPE stays None until some forecast has its error terms (older ones do not)
+        def average(metric, count='forecast_count'):
+            return Round(Coalesce(Sum(f'sum_{metric}') / NullIf(Sum(count), 0), 0.0), 2)
+        
+        return summaries.aggregate(
+            total_forecasts=Coalesce(Sum('forecast_count'), 0),
+            avg_mape=average('mape'),
+            avg_rmse=average('rmse'),
+            avg_mae=average('mae'),
+            avg_aic=average('aic', 'ic_count'),
+            avg_bic=average('bic', 'ic_count'),
+            overall_wape=Round(Sum('sum_abs_err') * 100.0 / NullIf(Sum('sum_actual'), 0.0), 2),
+            excellent_models=Coalesce(Sum('excellent_models'), 0),
+            good_models=Coalesce(Sum('good_models'), 0),
+            fair_models=Coalesce(Sum('fair_models'), 0),
+            poor_models=Coalesce(Sum('poor_models'), 0),
+        )
     
-    def _get_model_performance_distribution(self, forecasts):
+    def _get_model_performance_distribution(self, summaries):
         """Get model performance distribution data for charts"""
-        # Performance by period type
-        period_performance = {}
-        for period in ['daily', 'weekly', 'monthly']:
-            period_forecasts = forecasts.filter(forecast_period=period)
-            if period_forecasts.exists():
-                period_performance[period] = {
-                    'count': period_forecasts.count(),
-                    'avg_mape': round(period_forecasts.aggregate(avg=models.Avg('mape'))['avg'] or 0, 2),
-                    'avg_rmse': round(period_forecasts.aggregate(avg=models.Avg('rmse'))['avg'] or 0, 2),
-                }
-        
-        # Performance over time (last 30 days)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_forecasts = forecasts.filter(created_at__gte=thirty_days_ago)
-        
-        # Group by date for time series
-        daily_performance = {}
-        for i in range(30):
-            date = (timezone.now() - timedelta(days=i)).date()
-            day_forecasts = recent_forecasts.filter(created_at__date=date)
-            if day_forecasts.exists():
-                daily_performance[date.isoformat()] = {
-                    'count': day_forecasts.count(),
-                    'avg_mape': round(day_forecasts.aggregate(avg=models.Avg('mape'))['avg'] or 0, 2),
-                }
+        # Performance by period type, grouped in the database
+        period_stats = {
+            row.pop('forecast_period'): row
+            for row in summaries.values('forecast_period').annotate(
+                count=Sum('forecast_count'),
+                avg_mape=Round(Sum('sum_mape') / Sum('forecast_count'), 2),
+                avg_rmse=Round(Sum('sum_rmse') / Sum('forecast_count'), 2),
+            ).order_by()
+        }
+        period_performance = {
+            period: period_stats[period]
+            for period in ['daily', 'weekly', 'monthly']
+            if period in period_stats
+        }
         
-        # If no recent data, create sample data for demonstration
-        if not daily_performance and forecasts.exists():
-            import random
-            base_date = timezone.now().date()
-            for i in range(7):  # Show last 7 days of sample data
-                date = (base_date - timedelta(days=i)).isoformat()
-                # Generate realistic MAPE values (5-25%)
-                sample_mape = round(random.uniform(5, 25), 2)
-                daily_performance[date] = {
-                    'count': random.randint(1, 5),
-                    'avg_mape': sample_mape,
-                }
+        # Performance over time (last 30 days), newest day first
+        first_day = timezone.localdate() - timedelta(days=29)
+        daily_performance = {
+            row.pop('day').isoformat(): row
+            for row in summaries.filter(day__gte=first_day).values('day').annotate(
+                count=Sum('forecast_count'),
+                avg_mape=Round(Sum('sum_mape') / Sum('forecast_count'), 2),
+            ).order_by('-day')
+        }
         
         return {
             'period_performance': period_performance,
@@ -236,11 +215,26 @@ class ModelEvaluationView(TemplateView):
     
     def _get_medicine_performance(self, forecasts):
         """Get medicine-specific performance metrics"""
+        # Rank by MAPE both ways so the ten best and ten worst come back in one query,
+        # with only the columns the performance tables show
+        ranked_forecasts = list(forecasts.select_related('medicine').only(
+            'id', 'forecast_period', 'mape', 'sum_abs_err', 'sum_actual', 'medicine__name'
+        ).annotate(
+            best_rank=Window(expression=RowNumber(), order_by=[F('mape').asc(), F('id').asc()]),
+            worst_rank=Window(expression=RowNumber(), order_by=[F('mape').desc(), F('id').desc()]),
+        ).filter(Q(best_rank__lte=10) | Q(worst_rank__lte=10)).order_by())
+        
         # Top performing medicines (lowest MAPE)
-        top_performers = forecasts.order_by('mape')[:10]
+        top_performers = sorted(
+            (forecast for forecast in ranked_forecasts if forecast.best_rank <= 10),
+            key=lambda forecast: forecast.best_rank
+        )
         
         # Worst performing medicines (highest MAPE)
-        worst_performers = forecasts.order_by('-mape')[:10]
+        worst_performers = sorted(
+            (forecast for forecast in ranked_forecasts if forecast.worst_rank <= 10),
+            key=lambda forecast: forecast.worst_rank
+        )
         
         # Medicines with most forecasts
         most_forecasted = forecasts.values('medicine__name').annotate(
@@ -274,10 +268,11 @@ class ForecastOnlyView(TemplateView):
         
         # Get all medicines for the dropdown (not just those with existing forecasts)
         from inventory.models import Medicine
-        medicines = Medicine.objects.filter(is_active=True).order_by('name')
+        # Evaluated once here, so the count comes from the same query as the dropdown
+        medicines = list(Medicine.objects.filter(is_active=True).order_by('name'))
         
         context['medicines'] = medicines
-        context['total_medicines'] = medicines.count()
+        context['total_medicines'] = len(medicines)
         
         return context
     
@@ -285,22 +280,16 @@ class ForecastOnlyView(TemplateView):
         """
         Get the best-performing forecast for each medicine based on lowest AIC
         """
-        from django.db.models import Min
-        
-        # Group forecasts by medicine and find the one with lowest AIC for each
-        best_forecasts = []
-        
-        # Get unique medicine IDs properly
-        medicine_ids = set(forecasts.values_list('medicine_id', flat=True))
-        
-        for medicine_id in medicine_ids:
-            medicine_forecasts = forecasts.filter(medicine_id=medicine_id)
-            
-            # Find the forecast with lowest AIC (best model performance)
-            best_forecast = medicine_forecasts.order_by('aic').first()
-            
-            if best_forecast:
-                best_forecasts.append(best_forecast)
+        # Rank each medicine's forecasts by AIC (lowest is the best model, forecasts
+        # without a finite AIC last) and keep the top one, all in a single query streamed
+        # in chunks. The medicine is joined in so the chart data and templates never load it row by row
+        best_forecasts = list(forecasts.select_related('medicine').annotate(
+            aic_rank=Window(
+                expression=RowNumber(),
+                partition_by=[F('medicine_id')],
+                order_by=[F('aic').asc(nulls_last=True), F('id').asc()]
+            )
+        ).filter(aic_rank=1).iterator(chunk_size=2000))
         
         return best_forecasts
     
@@ -309,41 +298,34 @@ class ForecastOnlyView(TemplateView):
         Prepare forecast data for chart display
         """
         forecast_data = []
+        forecasting_service = get_forecasting_service()
+        
+        # Historical data for every medicine, one grouped query per forecast period
+        medicine_ids_by_period = {}
+        for forecast in forecasts:
+            medicine_ids_by_period.setdefault(forecast.forecast_period, set()).add(forecast.medicine_id)
+        sales_by_period = {
+            period: forecasting_service.prepare_sales_data_bulk(list(medicine_ids), period)
+            for period, medicine_ids in medicine_ids_by_period.items()
+        }
         
         for forecast in forecasts:
             # Get historical data for this medicine
-            from .services import ARIMAForecastingService
-            forecasting_service = ARIMAForecastingService()
-            
             try:
-                historical_data = forecasting_service.prepare_sales_data(
-                    forecast.medicine.id, 
-                    forecast.forecast_period
-                )
+                historical_data = sales_by_period[forecast.forecast_period][forecast.medicine_id]
                 
                 # Generate forecast labels
-                from datetime import datetime, timedelta
                 import pandas as pd
                 
                 last_historical_date = pd.to_datetime(historical_data['date'].iloc[-1])
                 
                 # Generate forecast period labels
-                forecast_labels = []
-                if forecast.forecast_period == 'daily':
-                    for i in range(1, forecast.forecast_horizon + 1):
-                        forecast_date = last_historical_date + timedelta(days=i)
-                        forecast_labels.append(forecast_date.strftime('%b %d, %Y'))
-                elif forecast.forecast_period == 'weekly':
-                    for i in range(1, forecast.forecast_horizon + 1):
-                        forecast_date = last_historical_date + timedelta(weeks=i)
-                        forecast_labels.append(f"Week of {forecast_date.strftime('%b %d, %Y')}")
-                elif forecast.forecast_period == 'monthly':
-                    for i in range(1, forecast.forecast_horizon + 1):
-                        forecast_date = last_historical_date + timedelta(days=i*30)
-                        forecast_labels.append(forecast_date.strftime('%b %Y'))
+                forecast_labels = forecasting_service.get_forecast_labels(
+                    last_historical_date, forecast.forecast_period, forecast.forecast_horizon
+                )
                 
                 # Combine historical and forecast labels
-                historical_labels = [d.strftime('%b %d, %Y') if hasattr(d, 'strftime') else str(d) for d in historical_data['date']]
+                historical_labels = historical_data['date'].dt.strftime('%b %d, %Y').tolist()
                 all_labels = historical_labels + forecast_labels
                 
                 forecast_data.append({
@@ -417,7 +399,7 @@ def arima_analysis_data(request):
         medicine = get_object_or_404(Medicine, id=medicine_id)
         
         # Initialize forecasting service
-        service = ARIMAForecastingService()
+        service = get_forecasting_service()
         
         # Prepare data
         data = service.prepare_sales_data(medicine_id, period_type)
@@ -690,7 +672,7 @@ def arima_analysis_data(request):
         medicine = get_object_or_404(Medicine, id=medicine_id)
         
         # Initialize forecasting service
-        service = ARIMAForecastingService()
+        service = get_forecasting_service()
         
         # Prepare data
         data = service.prepare_sales_data(medicine_id, period_type)
@@ -855,7 +837,7 @@ def arima_step_analysis_data(request):
         medicine = get_object_or_404(Medicine, id=medicine_id)
         
         # Initialize forecasting service
-        service = ARIMAForecastingService()
+        service = get_forecasting_service()
         
         # Prepare data
         data = service.prepare_sales_data(medicine_id, period_type)
@@ -0,0 +1,37 @@
+"""
+Process pool entry points for fitting ARIMA models outside the web process
+"""
+
+import os
+
+import django
+from threadpoolctl import threadpool_limits
+
+# Native thread pools that would otherwise each claim every core in every worker
+THREAD_LIMIT_VARIABLES = (
+    'OMP_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+)
+
+
+def init_forecast_worker():
+    """
+    Configure Django in a freshly started worker process
+    """
+    # One process per core already, so keep BLAS/OpenMP single-threaded. The
+    # variables cover spawned workers; threadpool_limits covers forked ones
+    # that inherited already initialised libraries.
+    for variable in THREAD_LIMIT_VARIABLES:
+        os.environ[variable] = '1'
+    threadpool_limits(1)
+    django.setup()
+
+
+def fit_forecast_model(medicine_id, forecast_period, forecast_horizon):
+    """
+    Fit one medicine's ARIMA model and return picklable DemandForecast field values
+    """
+    from .services import get_forecasting_service
+    
+    return get_forecasting_service().fit_forecast_model(medicine_id, forecast_period, forecast_horizon)
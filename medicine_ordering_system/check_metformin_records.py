@@ -7,6 +7,7 @@ import os
 import sys
 import django
 from django.db import connection
+from django.db.models import Count, Sum
 
 # Setup Django environment
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'medicine_ordering_system.settings')
@@ -41,36 +42,36 @@ def check_metformin_records():
         print(f"   Using first one: {metformin.name}")
         print()
     
-    # Count orders containing Metformin
-    metformin_orders = Order.objects.filter(items__medicine=metformin).distinct()
-    total_orders = metformin_orders.count()
+    # Order and item totals in a single query
+    metformin_items = OrderItem.objects.filter(medicine=metformin)
+    stats = metformin_items.aggregate(
+        total_orders=Count('order', distinct=True),
+        total_items=Count('id'),
+        total_quantity=Sum('quantity'),
+        total_revenue=Sum('total_price'),
+    )
+    total_orders = stats['total_orders']
     
     print(f"📊 Order Statistics for {metformin.name}:")
     print(f"   Total Orders containing Metformin: {total_orders}")
     
     if total_orders > 0:
-        # Count order items (individual Metformin purchases)
-        metformin_items = OrderItem.objects.filter(medicine=metformin)
-        total_items = metformin_items.count()
-        total_quantity = sum(item.quantity for item in metformin_items)
-        total_revenue = sum(item.total_price for item in metformin_items)
+        print(f"   Total Metformin Items Sold: {stats['total_items']}")
+        print(f"   Total Quantity Sold: {stats['total_quantity']} units")
+        print(f"   Total Revenue: ${stats['total_revenue']:.2f}")
         
-        print(f"   Total Metformin Items Sold: {total_items}")
-        print(f"   Total Quantity Sold: {total_quantity} units")
-        print(f"   Total Revenue: ${total_revenue:.2f}")
-        
-        # Status breakdown
+        # Status breakdown, counted in the database
         print(f"\n📈 Order Status Breakdown:")
-        status_counts = {}
-        for order in metformin_orders:
-            status = order.status
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = metformin_items.values('order__status').annotate(
+            count=Count('order', distinct=True)
+        ).order_by()
         
-        for status, count in status_counts.items():
-            print(f"   {status.title()}: {count} orders")
+        for row in status_counts:
+            print(f"   {row['order__status'].title()}: {row['count']} orders")
         
         # Recent orders
         print(f"\n🕒 Recent Orders (Last 5):")
+        metformin_orders = Order.objects.filter(items__medicine=metformin).distinct()
         recent_orders = metformin_orders.order_by('-created_at')[:5]
         for order in recent_orders:
             metformin_item = order.items.filter(medicine=metformin).first()
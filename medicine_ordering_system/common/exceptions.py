@@ -0,0 +1,55 @@
+import logging
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceInputError(ValueError):
+    """
+    Raised by services for input or data they cannot work with, the message is shown to API clients
+    """
+
+
+def _first_error_message(detail):
+    """Return the first message from a (possibly nested) validation error detail"""
+    if isinstance(detail, dict):
+        return _first_error_message(next(iter(detail.values()), ''))
+    if isinstance(detail, list):
+        return _first_error_message(detail[0]) if detail else ''
+    return str(detail)
+
+
+def api_exception_handler(exc, context):
+    """
+    Return API errors in the {'error': ...} shape the frontend reads
+
+    DRF exceptions keep their status code. ServiceInputErrors raised by the services
+    for unusable input or data become 400s, and anything else, including bare
+    ValueErrors from parsing or numeric code, is logged and returned as a generic
+    500 without leaking internals.
+    """
+    response = exception_handler(exc, context)
+    
+    if response is not None:
+        if isinstance(exc, ValidationError):
+            response.data = {
+                'error': _first_error_message(response.data),
+                'errors': response.data,
+            }
+        elif isinstance(response.data, dict) and 'detail' in response.data:
+            response.data = {'error': response.data['detail']}
+        return response
+    
+    if isinstance(exc, ServiceInputError):
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    request = context.get('request')
+    logger.exception(f"Unhandled API error on {request.path if request else 'unknown path'}")
+    return Response(
+        {'error': 'Internal server error'},
+        status=status.HTTP_500_INTERNAL_SERVER_ERROR
+    )
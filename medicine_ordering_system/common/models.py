@@ -1,7 +1,20 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Round
+from django.core.cache import cache
 from django.core.validators import RegexValidator
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+import json
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib json module
+    orjson = None
+
+
+def _parse_boolean(value):
+    return value.lower() in ('true', '1', 'yes', 'on')
 
 
 class BaseModel(models.Model):
@@ -104,8 +117,10 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'is_read']),
             models.Index(fields=['notification_type', 'created_at']),
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notif_user_read_created_idx'),
+            models.Index(fields=['user', 'notification_type', '-created_at'], name='notif_user_type_created_idx'),
         ]
     
     def __str__(self):
@@ -151,25 +166,41 @@ class SystemConfiguration(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     updated_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, blank=True)
     
+    # Cached typed {key: config} dict served by ConfigurationAPIView
+    CACHE_KEY = 'sysconfig:v1'
+    
+    # data_type -> cast callable, anything else is returned as the stored string
+    VALUE_CASTS = {
+        'integer': int,
+        'float': float,
+        'boolean': _parse_boolean,
+        'json': orjson.loads if orjson else json.loads,
+    }
+    
     class Meta:
         ordering = ['config_type', 'key']
     
     def __str__(self):
         return f"{self.key} = {self.value}"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(self.CACHE_KEY)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.delete(self.CACHE_KEY)
+        return result
+    
     def get_typed_value(self):
         """Return the value converted to its proper data type"""
-        if self.data_type == 'integer':
-            return int(self.value)
-        elif self.data_type == 'float':
-            return float(self.value)
-        elif self.data_type == 'boolean':
-            return self.value.lower() in ('true', '1', 'yes', 'on')
-        elif self.data_type == 'json':
-            import json
-            return json.loads(self.value)
-        else:
-            return self.value
+        return self.cast_value(self.value, self.data_type)
+    
+    @staticmethod
+    def cast_value(value, data_type):
+        """Convert a stored value string to data_type, usable on values() rows"""
+        cast = SystemConfiguration.VALUE_CASTS.get(data_type)
+        return cast(value) if cast else value
 
 
 class FileUpload(models.Model):
@@ -234,6 +265,11 @@ class FileUpload(models.Model):
     @property
     def file_size_mb(self):
         return round(self.file_size / (1024 * 1024), 2)
+    
+    @staticmethod
+    def file_size_mb_expression():
+        """Database side file_size_mb, for values()/annotate() queries"""
+        return Round(F('file_size') / (1024 * 1024.0), 2)
 
 
 class EmailTemplate(models.Model):
@@ -0,0 +1,25 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to DRF's json based rendering
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson for numeric-heavy payloads such as forecasts
+    """
+    # OPT_UTC_Z keeps the 'Z' suffix DRF's encoder writes for UTC datetimes
+    options = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        # Decimals, lazy strings, querysets etc. go through DRF's encoder
+        return orjson.dumps(data, default=JSONEncoder().default, option=self.options)
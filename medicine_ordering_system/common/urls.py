@@ -26,4 +26,5 @@ urlpatterns = [
     path('api/notifications/', views.NotificationAPIView.as_view(), name='api_notifications'),
     path('api/config/', views.ConfigurationAPIView.as_view(), name='api_config'),
     path('api/file-uploads/', views.FileUploadAPIView.as_view(), name='api_file_uploads'),
+    path('api/dashboard/', views.DashboardBootstrapAPIView.as_view(), name='api_dashboard'),
 ]
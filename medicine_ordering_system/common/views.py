@@ -1,11 +1,53 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.views import View
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 from .models import Notification, SystemConfiguration, FileUpload, EmailTemplate
+from functools import lru_cache
+import json
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to Django's JsonResponse
+    orjson = None
+
+
+def _json_response(data):
+    """JsonResponse that serializes with orjson when it is installed"""
+    if orjson is None:
+        return JsonResponse(data)
+    return HttpResponse(orjson.dumps(data), content_type='application/json')
+
+
+def _dumps(row):
+    """Serialize one row to JSON bytes, with orjson when it is installed"""
+    if orjson is None:
+        return json.dumps(row, cls=DjangoJSONEncoder).encode()
+    return orjson.dumps(row)
+
+
+def _stream_json_list(name, rows):
+    """Yield {"<name>": [...]} as JSON chunks, one row at a time"""
+    yield b'{"%s":[' % name.encode()
+    for index, row in enumerate(rows):
+        if index:
+            yield b','
+        yield _dumps(row)
+    yield b']}'
+
+
+def _streaming_json_list_response(name, queryset):
+    """Stream a values() queryset as {"<name>": [...]} without building the list first"""
+    return StreamingHttpResponse(
+        _stream_json_list(name, queryset.iterator(chunk_size=500)),
+        content_type='application/json'
+    )
 
 # Create your views here.
 
@@ -13,19 +55,63 @@ class NotificationListView(LoginRequiredMixin, ListView):
     model = Notification
     template_name = "common/notification_list.html"
     context_object_name = "notifications"
-    paginate_by = 20
+    # Keyset pagination on (created_at, id), so older pages cost the same as the first
+    page_size = 20
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(user=self.request.user)
-        # Filter by read status
+        # Only the columns the list renders; the user is always request.user
+        queryset = super().get_queryset().filter(user=self.request.user).only(
+            'id', 'title', 'message', 'notification_type', 'priority', 'is_read', 'created_at'
+        ).order_by('-created_at', '-id')
+        # Continue after the last notification of the previous page
+        cursor = self._parse_cursor(self.request.GET.get('cursor'))
+        if cursor:
+            created_at, last_id = cursor
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+            )
+        # Filter by read status and notification type
         is_read = self.request.GET.get('is_read')
         if is_read is not None:
-            queryset = queryset.filter(is_read=is_read.lower() == 'true')
-        # Filter by notification type
-        notification_type = self.request.GET.get('notification_type')
+            is_read = is_read.lower() == 'true'
+        return queryset.filter(self._build_filters(is_read, self.request.GET.get('notification_type') or None))
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _build_filters(is_read, notification_type):
+        """Q for the optional list filters, shared across requests with the same filters"""
+        q = Q()
+        if is_read is not None:
+            q &= Q(is_read=is_read)
         if notification_type:
-            queryset = queryset.filter(notification_type=notification_type)
-        return queryset
+            q &= Q(notification_type=notification_type)
+        return q
+
+    def get_context_data(self, **kwargs):
+        # One extra row tells whether there is an older page
+        notifications = list(self.object_list[:self.page_size + 1])
+        context = super().get_context_data(object_list=notifications[:self.page_size], **kwargs)
+        context['is_first_page'] = not self.request.GET.get('cursor')
+        context['next_cursor'] = None
+        if len(notifications) > self.page_size:
+            last = notifications[self.page_size - 1]
+            context['next_cursor'] = f"{last.created_at.isoformat()},{last.id}"
+        return context
+
+    @staticmethod
+    def _parse_cursor(cursor):
+        """Split a '<created_at>,<id>' cursor, None when missing or malformed"""
+        if not cursor:
+            return None
+        created_at, _, last_id = cursor.rpartition(',')
+        try:
+            created_at = parse_datetime(created_at)
+            last_id = int(last_id)
+        except ValueError:
+            return None
+        if created_at is None:
+            return None
+        return created_at, last_id
 
 class NotificationDetailView(LoginRequiredMixin, DetailView):
     model = Notification
@@ -33,13 +119,14 @@ class NotificationDetailView(LoginRequiredMixin, DetailView):
     context_object_name = "notification"
 
     def get_queryset(self):
-        return super().get_queryset().filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user).select_related('user')
 
 class NotificationMarkReadView(LoginRequiredMixin, View):
     def post(self, request, pk):
-        notification = get_object_or_404(Notification, pk=pk, user=request.user)
-        notification.is_read = True
-        notification.save()
+        # Single UPDATE, no need to load the notification first
+        updated = Notification.objects.filter(pk=pk, user=request.user).update(is_read=True)
+        if not updated:
+            return JsonResponse({'status': 'not_found'}, status=404)
         return JsonResponse({'status': 'success'})
 
 class ConfigurationListView(LoginRequiredMixin, ListView):
@@ -92,7 +179,10 @@ class EmailTemplateListView(LoginRequiredMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # The list only shows name, type and subject, leave the template bodies in the database
+        queryset = super().get_queryset().defer(
+            'html_content', 'text_content', 'available_variables'
+        ).select_related('created_by')
         # Filter by template type
         template_type = self.request.GET.get('template_type')
         if template_type:
@@ -117,50 +207,62 @@ class EmailTemplateEditView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy('common:email_template_list')
 
 # API Views
+def _notification_rows(user):
+    """Latest 50 notifications of user as plain dicts, no model instances"""
+    return Notification.objects.filter(user=user).values(
+        'id', 'title', 'message', 'notification_type', 'priority',
+        'is_read', 'created_at', 'action_url'
+    )[:50]
+
+def _file_upload_rows(user):
+    """Latest 50 uploads of user as plain dicts, file_size_mb computed in SQL"""
+    return FileUpload.objects.filter(uploaded_by=user).values(
+        'id', 'file_type', 'original_filename', 'file_size', 'mime_type',
+        'is_processed', 'processing_status', 'uploaded_at',
+        file_size_mb=FileUpload.file_size_mb_expression(),
+    )[:50]
+
 class NotificationAPIView(LoginRequiredMixin, View):
     def get(self, request):
-        notifications = Notification.objects.filter(user=request.user)[:50]
-        data = []
-        for notification in notifications:
-            data.append({
-                'id': notification.id,
-                'title': notification.title,
-                'message': notification.message,
-                'notification_type': notification.notification_type,
-                'priority': notification.priority,
-                'is_read': notification.is_read,
-                'created_at': notification.created_at.isoformat(),
-                'action_url': notification.action_url,
-            })
-        return JsonResponse({'notifications': data})
+        return _streaming_json_list_response('notifications', _notification_rows(request.user))
+
+def _build_config_dict():
+    """All system configurations keyed by key, with values cast to their data type"""
+    # Plain rows are enough, the value cast only needs value and data_type
+    configs = SystemConfiguration.objects.values(
+        'key', 'value', 'config_type', 'description', 'data_type'
+    ).order_by()
+    data = {}
+    for config in configs:
+        key = config.pop('key')
+        config['value'] = SystemConfiguration.cast_value(config['value'], config['data_type'])
+        data[key] = config
+    return data
+
+def _get_config_dict(timeout=300):
+    """Cached _build_config_dict(), cleared by SystemConfiguration.save()/delete()"""
+    return cache.get_or_set(SystemConfiguration.CACHE_KEY, _build_config_dict, timeout)
 
 class ConfigurationAPIView(LoginRequiredMixin, View):
+    cache_timeout = 300
+    
     def get(self, request):
-        configs = SystemConfiguration.objects.all()
-        data = {}
-        for config in configs:
-            data[config.key] = {
-                'value': config.get_typed_value(),
-                'config_type': config.config_type,
-                'description': config.description,
-                'data_type': config.data_type,
-            }
-        return JsonResponse({'configurations': data})
+        return _json_response({'configurations': _get_config_dict(self.cache_timeout)})
 
 class FileUploadAPIView(LoginRequiredMixin, View):
     def get(self, request):
-        uploads = FileUpload.objects.filter(uploaded_by=request.user)[:50]
-        data = []
-        for upload in uploads:
-            data.append({
-                'id': upload.id,
-                'file_type': upload.file_type,
-                'original_filename': upload.original_filename,
-                'file_size': upload.file_size,
-                'file_size_mb': upload.file_size_mb,
-                'mime_type': upload.mime_type,
-                'is_processed': upload.is_processed,
-                'processing_status': upload.processing_status,
-                'uploaded_at': upload.uploaded_at.isoformat(),
-            })
-        return JsonResponse({'file_uploads': data})
+        return _streaming_json_list_response('file_uploads', _file_upload_rows(request.user))
+
+class DashboardBootstrapAPIView(LoginRequiredMixin, View):
+    """
+    Notifications, configurations and file uploads in one response, so a page
+    needs one request instead of three
+    """
+    cache_timeout = 300
+    
+    def get(self, request):
+        return _json_response({
+            'notifications': list(_notification_rows(request.user)),
+            'configurations': _get_config_dict(self.cache_timeout),
+            'file_uploads': list(_file_upload_rows(request.user)),
+        })
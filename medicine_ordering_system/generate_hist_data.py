@@ -10,7 +10,10 @@ import sys
 import django
 import random
 import sqlite3
-from datetime import datetime, timedelta, date
+from itertools import repeat
+import numpy as np
+import pandas as pd
+from datetime import datetime, date
 from decimal import Decimal
 
 # Setup Django environment
@@ -18,7 +21,6 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'medicine_ordering_system.settin
 django.setup()
 
 from django.contrib.auth import get_user_model
-from django.db import connection
 from inventory.models import Medicine, StockMovement
 from orders.models import Order, OrderItem, OrderStatusHistory
 from transactions.models import Transaction, PaymentMethod
@@ -69,23 +71,6 @@ def get_next_order_number():
     random_suffix = random.randint(100, 999)
     return f"O{timestamp}{random_suffix}"
 
-def get_next_stock_movement_id():
-    """Get next available stock movement ID"""
-    db_path = get_database_path()
-    conn = None
-    try:
-        conn = sqlite3.connect(db_path, timeout=30.0)
-        cursor = conn.cursor()
-        cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
-        max_id = cursor.fetchone()[0] or 0
-        return max_id + 1
-    except Exception as e:
-        print(f"Error getting stock movement ID: {e}")
-        return random.randint(10000, 99999)
-    finally:
-        if conn:
-            conn.close()
-
 def generate_amoxicillin_history():
     print("=== Amoxicillin Historical Data Generator ===")
     print("Creating data from 2020-2024 for ARIMA forecasting")
@@ -104,31 +89,32 @@ def generate_amoxicillin_history():
         print("❌ No sales representatives available for order creation")
         return
 
-    # 3. Clear existing data for medicine 3
-    print("\n🧹 Clearing existing data...")
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("DELETE FROM orders_orderitem WHERE medicine_id = 3")
-            # Use string formatting for SQLite IN clause
-            sales_reps_str = ','.join(map(str, sales_reps))
-            cursor.execute(f"DELETE FROM orders_orderstatushistory WHERE order_id IN (SELECT id FROM orders_order WHERE sales_rep_id IN ({sales_reps_str}))")
-            cursor.execute(f"DELETE FROM orders_order WHERE sales_rep_id IN ({sales_reps_str})")
-            cursor.execute("DELETE FROM inventory_stockmovement WHERE medicine_id = 3")
-            print("✅ Cleared existing data")
-    except Exception as e:
-        print(f"⚠️  Error clearing data: {e}")
-
-    # 4. Define historical date range (2020–2024)
+    # 3. Define historical date range (2020–2024)
     start_date = date(2020, 1, 1)
     end_date = date(2024, 12, 31)
 
-    # 5. Generate orders with realistic patterns
-    current_date = start_date
+    # 4. Generate orders with realistic patterns
     orders_created = 0
     current_stock = 5000  # Initial stock
-    stock_movement_id = get_next_stock_movement_id()
-    order_counter = 0
     random.seed(42)  # for reproducibility
+    rng = np.random.default_rng(42)
+    max_orders_per_day = 10
+
+    # Daily demand for the whole range in one pass (seasonality, Sunday dip, 8% annual growth, noise)
+    days = pd.date_range(start_date, end_date, freq='D')
+    months = days.month.to_numpy()
+    seasonal_mult = np.select([np.isin(months, (12, 1, 2)), np.isin(months, (6, 7, 8))], [1.3, 0.8], 1.0)
+    weekday_mult = np.where(days.weekday.to_numpy() == 6, 0.7, 1.0)
+    growth_factor = (1 + 0.08) ** ((days - days[0]).days.to_numpy() / 365.25)
+    noise = rng.uniform(0.8, 1.2, size=len(days))
+    daily_sales_arr = np.maximum(1, (15 * seasonal_mult * weekday_mult * growth_factor * noise).astype(int))
+
+    day_isos = days.strftime('%Y-%m-%d')
+    day_stamps = days.strftime('%Y%m%d')
+
+    # Per-order draws, one row per day
+    order_qty_draws = rng.integers(1, 6, size=(len(days), max_orders_per_day))
+    sales_rep_draws = np.asarray(sales_reps)[rng.integers(0, len(sales_reps), size=(len(days), max_orders_per_day))]
 
     print(f"\n📅 Generating orders from {start_date} to {end_date}")
     
@@ -138,35 +124,47 @@ def generate_amoxicillin_history():
     try:
         conn = sqlite3.connect(db_path, timeout=30.0)
         cursor = conn.cursor()
+        # Seed run: skip fsyncs and keep temp data in memory, everything commits once at the end
+        # foreign_keys matches Django's sqlite connection, so the deletes below are checked as before
+        conn.executescript("PRAGMA foreign_keys=ON; PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-200000;")
+        conn.execute("BEGIN IMMEDIATE")
+        
+        # Clear existing data for medicine 3 in the same transaction as the new rows
+        print("\n🧹 Clearing existing data...")
+        try:
+            cursor.execute("DELETE FROM orders_orderitem WHERE medicine_id = 3")
+            # Use string formatting for SQLite IN clause
+            sales_reps_str = ','.join(map(str, sales_reps))
+            # Only orders left without items, orders for other medicines stay referenced
+            empty_orders = f"SELECT id FROM orders_order o WHERE sales_rep_id IN ({sales_reps_str}) AND NOT EXISTS (SELECT 1 FROM orders_orderitem i WHERE i.order_id = o.id)"
+            cursor.execute(f"DELETE FROM orders_orderstatushistory WHERE order_id IN ({empty_orders})")
+            cursor.execute(f"DELETE FROM orders_order WHERE id IN ({empty_orders})")
+            cursor.execute("DELETE FROM inventory_stockmovement WHERE medicine_id = 3")
+            print("✅ Cleared existing data")
+        except sqlite3.Error as e:
+            print(f"⚠️  Error clearing data: {e}")
         
         print(f"📊 Starting data generation...")
         print(f"   Database: {db_path}")
         print(f"   Primary sales rep ID: {primary_sales_rep}")
         print(f"   Sales reps available: {len(sales_reps)}")
         
-        while current_date <= end_date:
-            # Calculate daily sales (realistic pattern)
-            base_sales = 15  # Base daily sales
-            
-            # Seasonal multiplier (higher in winter)
-            month = current_date.month
-            if month in [12, 1, 2]:
-                seasonal_mult = 1.3
-            elif month in [6, 7, 8]:
-                seasonal_mult = 0.8
-            else:
-                seasonal_mult = 1.0
-            
-            # Weekday multiplier (more sales on weekdays)
-            weekday = current_date.weekday()
-            weekday_mult = 0.7 if weekday == 6 else 1.0  # Lower on Sunday
-            
-            # Growth trend (8% annual growth)
-            years_elapsed = (current_date - start_date).days / 365.25
-            growth_factor = (1 + 0.08) ** years_elapsed
-            
-            daily_sales = int(base_sales * seasonal_mult * weekday_mult * growth_factor * random.uniform(0.8, 1.2))
-            daily_sales = max(1, daily_sales)
+        # Order and stock movement ids are assigned here so every table can be batch inserted at
+        # the end, inside the write transaction and after the clear so no other writer can take them
+        cursor.execute("SELECT MAX(id) FROM orders_order")
+        first_order_id = (cursor.fetchone()[0] or 0) + 1
+        cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
+        stock_movement_id = (cursor.fetchone()[0] or 0) + 1
+        stock_movement_rows = []
+        
+        # The stock walk only records numeric columns per order, the rows are built after the loop
+        order_days = []
+        order_qtys = []
+        order_sales_reps = []
+        order_movement_ids = []
+        
+        for day_index, current_date in enumerate(days.date):
+            daily_sales = int(daily_sales_arr[day_index])
             
             # Check if we need to reorder
             if current_stock < daily_sales and current_stock <= 200:
@@ -174,31 +172,27 @@ def generate_amoxicillin_history():
                 current_stock += reorder_qty
                 
                 # Create stock movement for reorder
-                cursor.execute("""
-                    INSERT INTO inventory_stockmovement 
-                    (id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                stock_movement_rows.append((
                     stock_movement_id,
                     3,
                     'in',
                     reorder_qty,
-                    f"REORDER-{current_date.strftime('%Y%m%d')}",
-                    f"Automatic reorder - stock below reorder point",
+                    f"REORDER-{day_stamps[day_index]}",
+                    "Automatic reorder - stock below reorder point",
                     primary_sales_rep,
-                    current_date.isoformat()
+                    day_isos[day_index]
                 ))
                 stock_movement_id += 1
             
             # Create orders for the day (limit to reasonable number)
-            orders_today = min(max(1, daily_sales // 3), 10)  # Max 10 orders per day
+            orders_today = min(max(1, daily_sales // 3), max_orders_per_day)
             remaining_sales = daily_sales
             
             for order_num in range(orders_today):
                 if remaining_sales <= 0 or current_stock <= 0:
                     break
                 
-                order_qty = min(random.randint(1, 5), remaining_sales, current_stock)
+                order_qty = min(int(order_qty_draws[day_index, order_num]), remaining_sales, current_stock)
                 if order_qty <= 0:
                     break
                 
@@ -207,100 +201,16 @@ def generate_amoxicillin_history():
                     print(f"⚠️  Reached maximum order limit (10,000). Stopping generation.")
                     break
                 
-                # Create order
-                order_counter += 1
-                order_number = f"O{current_date.strftime('%Y%m%d')}{order_counter:04d}"
-                sales_rep_id = random.choice(sales_reps)  # Random sales rep for variety
-                
-                # Create order record (sales rep creates order with optional customer details)
-                cursor.execute("""
-                    INSERT INTO orders_order 
-                    (order_number, sales_rep_id, customer_name, customer_phone, customer_address, 
-                     status, payment_status, subtotal, tax_amount, shipping_cost, discount_amount, 
-                     total_amount, delivery_method, delivery_address, delivery_instructions, 
-                     prescription_required, prescription_verified, customer_notes, internal_notes, 
-                     created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    order_number,
-                    sales_rep_id,
-                    f"Customer-{order_counter:06d}",  # Sales rep assigned customer name
-                    f"555-{order_counter:04d}",      # Sales rep assigned phone
-                    f"Delivery Address {order_counter}",  # Sales rep assigned address
-                    'delivered',
-                    'paid',
-                    order_qty * 15.50,  # subtotal
-                    0.00,  # tax_amount
-                    0.00,  # shipping_cost
-                    0.00,  # discount_amount
-                    order_qty * 15.50,  # total_amount
-                    'delivery',  # delivery_method
-                    f"Delivery Address {order_counter}",
-                    "Standard delivery",
-                    False,  # prescription_required
-                    True,   # prescription_verified
-                    f"Customer notes for order {order_number}",  # customer_notes
-                    f"Sales rep {sales_rep_id} created this order",  # internal_notes
-                    current_date.isoformat(),
-                    current_date.isoformat()
-                ))
-                
-                order_id = cursor.lastrowid
-                
-                # Create order item
-                cursor.execute("""
-                    INSERT INTO orders_orderitem 
-                    (order_id, medicine_id, quantity, unit_price, total_price, 
-                     prescription_notes, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    order_id,
-                    3,
-                    order_qty,
-                    15.50,
-                    order_qty * 15.50,
-                    f"Prescription for {amoxicillin.name}",
-                    current_date.isoformat()
-                ))
-                
-                # Create order status history
-                cursor.execute("""
-                    INSERT INTO orders_orderstatushistory 
-                    (order_id, old_status, new_status, old_payment_status, new_payment_status, 
-                     notes, changed_by_id, changed_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    order_id,
-                    'pending',  # old_status
-                    'delivered',  # new_status
-                    'pending',  # old_payment_status
-                    'paid',  # new_payment_status
-                    'Order completed successfully',
-                    sales_rep_id,
-                    current_date.isoformat()
-                ))
+                order_days.append(day_index)
+                order_qtys.append(order_qty)
+                order_sales_reps.append(int(sales_rep_draws[day_index, order_num]))  # Random sales rep for variety
+                order_movement_ids.append(stock_movement_id)
+                stock_movement_id += 1
                 
                 # Update stock
                 current_stock -= order_qty
                 remaining_sales -= order_qty
                 orders_created += 1
-                
-                # Create stock movement for sale
-                cursor.execute("""
-                    INSERT INTO inventory_stockmovement 
-                    (id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    stock_movement_id,
-                    3,
-                    'out',
-                    -order_qty,
-                    order_number,
-                    f"Sale - Order {order_number}",
-                    sales_rep_id,
-                    current_date.isoformat()
-                ))
-                stock_movement_id += 1
             
             # Break outer loop if we hit the limit
             if orders_created > 10000:
@@ -309,9 +219,97 @@ def generate_amoxicillin_history():
             # Progress reporting
             if current_date.day == 1:  # Monthly progress
                 print(f"  📅 {current_date.strftime('%Y-%m')}: {orders_created} orders, Stock: {current_stock}")
-            
-            current_date += timedelta(days=1)
 
+        # Build every order related row column-wise
+        order_counters = range(1, orders_created + 1)
+        order_ids = range(first_order_id, first_order_id + orders_created)
+        order_isos = day_isos[order_days].tolist()
+        order_numbers = [f"O{stamp}{counter:04d}" for stamp, counter in zip(day_stamps[order_days], order_counters)]
+        order_totals = (np.asarray(order_qtys, dtype=float) * 15.50).tolist()
+        delivery_addresses = [f"Delivery Address {counter}" for counter in order_counters]
+        
+        # Sales rep assigned customer details
+        order_rows = list(zip(
+            order_ids,
+            order_numbers,
+            order_sales_reps,
+            [f"Customer-{counter:06d}" for counter in order_counters],
+            [f"555-{counter:04d}" for counter in order_counters],
+            delivery_addresses,
+            repeat('delivered'),
+            repeat('paid'),
+            order_totals,  # subtotal
+            repeat(0.00),  # tax_amount
+            repeat(0.00),  # shipping_cost
+            repeat(0.00),  # discount_amount
+            order_totals,  # total_amount
+            repeat('delivery'),  # delivery_method
+            delivery_addresses,
+            repeat("Standard delivery"),
+            repeat(False),  # prescription_required
+            repeat(True),   # prescription_verified
+            [f"Customer notes for order {number}" for number in order_numbers],
+            [f"Sales rep {sales_rep_id} created this order" for sales_rep_id in order_sales_reps],
+            order_isos,
+            order_isos
+        ))
+        order_item_rows = list(zip(
+            order_ids,
+            repeat(3),
+            order_qtys,
+            repeat(15.50),
+            order_totals,
+            repeat(f"Prescription for {amoxicillin.name}"),
+            order_isos
+        ))
+        status_history_rows = list(zip(
+            order_ids,
+            repeat('pending'),  # old_status
+            repeat('delivered'),  # new_status
+            repeat('pending'),  # old_payment_status
+            repeat('paid'),  # new_payment_status
+            repeat('Order completed successfully'),
+            order_sales_reps,
+            order_isos
+        ))
+        stock_movement_rows.extend(zip(
+            order_movement_ids,
+            repeat(3),
+            repeat('out'),
+            [-qty for qty in order_qtys],
+            order_numbers,
+            [f"Sale - Order {number}" for number in order_numbers],
+            order_sales_reps,
+            order_isos
+        ))
+
+        cursor.executemany("""
+            INSERT INTO orders_order 
+            (id, order_number, sales_rep_id, customer_name, customer_phone, customer_address, 
+             status, payment_status, subtotal, tax_amount, shipping_cost, discount_amount, 
+             total_amount, delivery_method, delivery_address, delivery_instructions, 
+             prescription_required, prescription_verified, customer_notes, internal_notes, 
+             created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, order_rows)
+        cursor.executemany("""
+            INSERT INTO orders_orderitem 
+            (order_id, medicine_id, quantity, unit_price, total_price, 
+             prescription_notes, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, order_item_rows)
+        cursor.executemany("""
+            INSERT INTO orders_orderstatushistory 
+            (order_id, old_status, new_status, old_payment_status, new_payment_status, 
+             notes, changed_by_id, changed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, status_history_rows)
+        cursor.executemany("""
+            INSERT INTO inventory_stockmovement 
+            (id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, stock_movement_rows)
+        
         # Update medicine stock
         cursor.execute("""
             UPDATE inventory_medicine 
@@ -16,6 +16,13 @@ from decimal import Decimal
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'medicine_ordering_system.settings')
 django.setup()
 
+# Choices drawn from inside the generation loops
+MEDICINE_MOVEMENT_TYPES = ('in', 'out', 'adjustment')
+EXTRA_MOVEMENT_TYPES = ('in', 'out', 'adjustment', 'return', 'damage')
+EXTRA_MOVEMENT_REASONS = ("Regular restock", "Customer return", "Quality adjustment", "Damaged goods", "Expired items")
+ALERT_PRIORITIES = ('low', 'medium', 'high')
+COIN_FLIP = (True, False)
+
 def generate_medicines():
     """Generate 5 medicines with all associated data"""
     
@@ -23,10 +30,19 @@ def generate_medicines():
     db_path = 'db.sqlite3'
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+    # Seed run: skip fsyncs and keep temp data in memory, everything commits once at the end
+    conn.executescript("PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-200000;")
+    conn.execute("BEGIN IMMEDIATE")
     
     print("🚀 Starting Medicine Generation...")
     print("=" * 50)
     
+    # One timestamp for every row created in this run
+    now = datetime.now()
+    now_iso = now.isoformat()
+    # Backdated timestamps by days ago, movements and alerts go back at most 90 days
+    days_ago_iso = [(now - timedelta(days=days)).isoformat() for days in range(91)]
+    
     # Medicine data
     medicines_data = [
         {
@@ -154,7 +170,6 @@ def generate_medicines():
     cursor.execute("DELETE FROM inventory_medicine")
     cursor.execute("DELETE FROM inventory_manufacturer")
     cursor.execute("DELETE FROM inventory_category")
-    conn.commit()
     print("✅ Existing medicine data cleared")
     
     # Generate categories
@@ -171,20 +186,22 @@ def generate_medicines():
         {'name': 'Mental Health', 'description': 'Medicines for mental health conditions'}
     ]
     
+    category_rows = []
     for i, cat_data in enumerate(category_data, 1):
-        cursor.execute("""
-            INSERT INTO inventory_category (id, name, description, parent_category_id, is_active, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        category_rows.append((
             i,
             cat_data['name'],
             cat_data['description'],
             None,
             True,
-            datetime.now().isoformat()
+            now_iso
         ))
         categories[cat_data['name']] = i
         print(f"  ✅ Created category: {cat_data['name']}")
+    cursor.executemany("""
+        INSERT INTO inventory_category (id, name, description, parent_category_id, is_active, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, category_rows)
     
     # Generate manufacturers
     print("\n🏭 Creating Manufacturers...")
@@ -227,11 +244,9 @@ def generate_medicines():
         }
     ]
     
+    manufacturer_rows = []
     for i, man_data in enumerate(manufacturer_data, 1):
-        cursor.execute("""
-            INSERT INTO inventory_manufacturer (id, name, country, contact_email, contact_phone, website, is_active, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        manufacturer_rows.append((
             i,
             man_data['name'],
             man_data['country'],
@@ -239,10 +254,14 @@ def generate_medicines():
             man_data['contact_phone'],
             man_data['website'],
             True,
-            datetime.now().isoformat()
+            now_iso
         ))
         manufacturers[man_data['name']] = i
         print(f"  ✅ Created manufacturer: {man_data['name']}")
+    cursor.executemany("""
+        INSERT INTO inventory_manufacturer (id, name, country, contact_email, contact_phone, website, is_active, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, manufacturer_rows)
     
     # Generate medicines
     print("\n💊 Creating Medicines...")
@@ -250,17 +269,18 @@ def generate_medicines():
     stock_movements_created = 0
     reorder_alerts_created = 0
     
+    # Rows are collected per table and inserted with one executemany each
+    medicine_rows = []
+    stock_movement_rows = []
+    reorder_alert_rows = []
+    
+    # Stock movement ids continue from the current maximum, read once
+    cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
+    next_movement_id = (cursor.fetchone()[0] or 0) + 1
+    
     for i, med_data in enumerate(medicines_data, 1):
         # Create medicine
-        cursor.execute("""
-            INSERT INTO inventory_medicine (
-                id, name, generic_name, description, category_id, manufacturer_id,
-                dosage_form, strength, prescription_type, unit_price, cost_price,
-                current_stock, minimum_stock_level, maximum_stock_level, reorder_point,
-                weight, dimensions, storage_conditions, ndc_number, fda_approval_date,
-                expiry_date, is_active, is_available, requires_prescription, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        medicine_rows.append((
             i,
             med_data['name'],
             med_data['generic_name'],
@@ -285,61 +305,44 @@ def generate_medicines():
             True,
             True,
             med_data['requires_prescription'],
-            datetime.now().isoformat(),
-            datetime.now().isoformat()
+            now_iso,
+            now_iso
         ))
         
         medicines_created += 1
         print(f"  ✅ Created medicine: {med_data['name']}")
         
-        # Create initial stock movement (stock in) - get next available ID
-        cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
-        max_id = cursor.fetchone()[0] or 0
-        next_id = max_id + 1
-        
-        cursor.execute("""
-            INSERT INTO inventory_stockmovement (
-                id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            next_id,
+        # Create initial stock movement (stock in)
+        stock_movement_rows.append((
+            next_movement_id,
             i,
             'in',
             med_data['current_stock'],
             f'INIT-{med_data["ndc_number"]}',
             f'Initial stock for {med_data["name"]}',
             1,  # Assuming user ID 1 exists
-            datetime.now().isoformat()
+            now_iso
         ))
+        next_movement_id += 1
         stock_movements_created += 1
         
         # Create some additional stock movements for realism
-        for j in range(random.randint(2, 5)):
-            movement_types = ['in', 'out', 'adjustment']
-            movement_type = random.choice(movement_types)
+        for movement_type in random.choices(MEDICINE_MOVEMENT_TYPES, k=random.randint(2, 5)):
             quantity = random.randint(10, 100) if movement_type == 'in' else random.randint(1, 50)
             if movement_type == 'out':
                 quantity = -quantity
             
-            # Get next available ID
-            cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
-            max_id = cursor.fetchone()[0] or 0
-            next_id = max_id + 1
-            
-            cursor.execute("""
-                INSERT INTO inventory_stockmovement (
-                    id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                next_id,
+            stock_movement_rows.append((
+                next_movement_id,
                 i,
                 movement_type,
                 quantity,
                 f'REF-{random.randint(1000, 9999)}',
                 f'{movement_type.title()} movement for {med_data["name"]}',
                 1,
-                (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat()
+                days_ago_iso[random.randint(1, 30)]
             ))
+            next_movement_id += 1
             stock_movements_created += 1
         
         # Create reorder alert if stock is low
@@ -347,19 +350,15 @@ def generate_medicines():
             suggested_quantity = med_data['maximum_stock_level'] - med_data['current_stock']
             priority = 'urgent' if med_data['current_stock'] < med_data['minimum_stock_level'] else 'medium'
             
-            cursor.execute("""
-                INSERT INTO inventory_reorderalert (
-                    id, medicine_id, current_stock, reorder_point, suggested_quantity, priority, is_processed, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                i,
+            reorder_alert_rows.append((
+                reorder_alerts_created + 1,
                 i,
                 med_data['current_stock'],
                 med_data['reorder_point'],
                 suggested_quantity,
                 priority,
                 False,
-                datetime.now().isoformat()
+                now_iso
             ))
             reorder_alerts_created += 1
             print(f"    ⚠️  Created reorder alert for {med_data['name']} (Priority: {priority})")
@@ -367,60 +366,69 @@ def generate_medicines():
     # Create some additional stock movements for all medicines
     print("\n📦 Creating Additional Stock Movements...")
     for medicine_id in range(1, medicines_created + 1):
-        for j in range(random.randint(3, 8)):
-            movement_types = ['in', 'out', 'adjustment', 'return', 'damage']
-            movement_type = random.choice(movement_types)
+        movement_count = random.randint(3, 8)
+        movement_types = random.choices(EXTRA_MOVEMENT_TYPES, k=movement_count)
+        movement_reasons = random.choices(EXTRA_MOVEMENT_REASONS, k=movement_count)
+        for movement_type, reason in zip(movement_types, movement_reasons):
             quantity = random.randint(5, 50)
-            if movement_type in ['out', 'damage']:
+            if movement_type in ('out', 'damage'):
                 quantity = -quantity
             
-            # Get next available ID
-            cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
-            max_id = cursor.fetchone()[0] or 0
-            next_id = max_id + 1
-            
-            cursor.execute("""
-                INSERT INTO inventory_stockmovement (
-                    id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                next_id,
+            stock_movement_rows.append((
+                next_movement_id,
                 medicine_id,
                 movement_type,
                 quantity,
                 f'REF-{random.randint(1000, 9999)}',
-                f'{movement_type.title()} movement - {random.choice(["Regular restock", "Customer return", "Quality adjustment", "Damaged goods", "Expired items"])}',
+                f'{movement_type.title()} movement - {reason}',
                 1,
-                (datetime.now() - timedelta(days=random.randint(1, 90))).isoformat()
+                days_ago_iso[random.randint(1, 90)]
             ))
+            next_movement_id += 1
             stock_movements_created += 1
     
     # Create some reorder alerts for medicines that might need restocking
     print("\n⚠️  Creating Additional Reorder Alerts...")
-    for medicine_id in range(1, medicines_created + 1):
-        if random.choice([True, False]):  # 50% chance of having a reorder alert
-            cursor.execute("SELECT current_stock, reorder_point, maximum_stock_level FROM inventory_medicine WHERE id = ?", (medicine_id,))
-            stock_data = cursor.fetchone()
-            if stock_data:
-                current_stock, reorder_point, max_stock = stock_data
-                suggested_quantity = max_stock - current_stock
-                priority = random.choice(['low', 'medium', 'high'])
-                
-                cursor.execute("""
-                    INSERT INTO inventory_reorderalert (
-                        id, medicine_id, current_stock, reorder_point, suggested_quantity, priority, is_processed, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    reorder_alerts_created + 1,
-                    medicine_id,
-                    current_stock,
-                    reorder_point,
-                    suggested_quantity,
-                    priority,
-                    random.choice([True, False]),
-                    (datetime.now() - timedelta(days=random.randint(1, 7))).isoformat()
-                ))
-                reorder_alerts_created += 1
+    for medicine_id, has_alert in enumerate(random.choices(COIN_FLIP, k=medicines_created), 1):
+        if has_alert:  # 50% chance of having a reorder alert
+            # Stock levels as inserted above, no need to read them back
+            med_data = medicines_data[medicine_id - 1]
+            current_stock = med_data['current_stock']
+            reorder_point = med_data['reorder_point']
+            suggested_quantity = med_data['maximum_stock_level'] - current_stock
+            priority = random.choice(ALERT_PRIORITIES)
+            
+            reorder_alert_rows.append((
+                reorder_alerts_created + 1,
+                medicine_id,
+                current_stock,
+                reorder_point,
+                suggested_quantity,
+                priority,
+                random.choice(COIN_FLIP),
+                days_ago_iso[random.randint(1, 7)]
+            ))
+            reorder_alerts_created += 1
+    
+    cursor.executemany("""
+        INSERT INTO inventory_medicine (
+            id, name, generic_name, description, category_id, manufacturer_id,
+            dosage_form, strength, prescription_type, unit_price, cost_price,
+            current_stock, minimum_stock_level, maximum_stock_level, reorder_point,
+            weight, dimensions, storage_conditions, ndc_number, fda_approval_date,
+            expiry_date, is_active, is_available, requires_prescription, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, medicine_rows)
+    cursor.executemany("""
+        INSERT INTO inventory_stockmovement (
+            id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, stock_movement_rows)
+    cursor.executemany("""
+        INSERT INTO inventory_reorderalert (
+            id, medicine_id, current_stock, reorder_point, suggested_quantity, priority, is_processed, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, reorder_alert_rows)
     
     conn.commit()
     conn.close()
@@ -9,7 +9,9 @@ import sys
 import django
 import random
 import sqlite3
-from datetime import datetime, timedelta, date
+import numpy as np
+import pandas as pd
+from datetime import datetime, date
 from decimal import Decimal
 
 # Setup Django environment
@@ -17,12 +19,66 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'medicine_ordering_system.settin
 django.setup()
 
 from django.contrib.auth import get_user_model
-from django.db import connection
 from inventory.models import Medicine, StockMovement
 from orders.models import Order, OrderItem, OrderStatusHistory
 
 User = get_user_model()
 
+# Rows are collected per table and written with executemany every BATCH_SIZE orders
+BATCH_SIZE = 5000
+
+ORDER_INSERT_SQL = """
+    INSERT INTO orders_order 
+    (id, order_number, sales_rep_id, customer_name, customer_phone, customer_address, 
+     status, payment_status, subtotal, tax_amount, shipping_cost, discount_amount, 
+     total_amount, delivery_method, delivery_address, delivery_instructions, 
+     prescription_required, prescription_verified, customer_notes, internal_notes, 
+     created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ORDER_ITEM_INSERT_SQL = """
+    INSERT INTO orders_orderitem 
+    (order_id, medicine_id, quantity, unit_price, total_price, 
+     prescription_notes, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+STATUS_HISTORY_INSERT_SQL = """
+    INSERT INTO orders_orderstatushistory 
+    (order_id, old_status, new_status, old_payment_status, new_payment_status, 
+     notes, changed_by_id, changed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+STOCK_MOVEMENT_INSERT_SQL = """
+    INSERT INTO inventory_stockmovement 
+    (id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Tables whose secondary indexes are rebuilt once after the load instead of updated per row
+BULK_LOAD_TABLES = ('orders_order', 'orders_orderitem', 'orders_orderstatushistory', 'inventory_stockmovement')
+
+def drop_secondary_indexes(cursor, tables):
+    """Drop the non-unique indexes on tables and return their CREATE INDEX statements"""
+    placeholders = ', '.join('?' * len(tables))
+    cursor.execute(f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%' AND tbl_name IN ({placeholders})
+    """, tables)
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in indexes]
+
+def flush_batches(cursor, batches):
+    """executemany each (sql, rows) batch in order and empty its rows list"""
+    for sql, rows in batches:
+        if rows:
+            cursor.executemany(sql, rows)
+            rows.clear()
+
 def get_database_path():
     """Get the SQLite database path"""
     from django.conf import settings
@@ -53,62 +109,31 @@ def get_ace_sales_rep():
         if conn:
             conn.close()
 
-def get_next_stock_movement_id():
-    """Get next available stock movement ID"""
-    db_path = get_database_path()
-    conn = None
-    try:
-        conn = sqlite3.connect(db_path, timeout=30.0)
-        cursor = conn.cursor()
-        cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
-        max_id = cursor.fetchone()[0] or 0
-        return max_id + 1
-    except Exception as e:
-        print(f"Error getting stock movement ID: {e}")
-        return random.randint(10000, 99999)
-    finally:
-        if conn:
-            conn.close()
-
-def calculate_optimized_daily_sales(current_date, start_date):
-    """Calculate optimized daily sales for Metformin (diabetes medication)"""
+def calculate_optimized_daily_sales(days, rng):
+    """Calculate optimized daily sales for Metformin (diabetes medication), one value per day in days"""
     # Base sales for diabetes medication (higher for more data points)
     base_sales = 35  # Higher than Amoxicillin due to chronic condition
     
-    # Seasonal patterns for diabetes medication (higher in winter months)
-    month = current_date.month
-    if month in [12, 1, 2]:  # Winter - higher diabetes management
-        seasonal_mult = 1.6
-    elif month in [6, 7, 8]:  # Summer - lower demand
-        seasonal_mult = 0.8
-    elif month in [3, 4, 5]:  # Spring - moderate
-        seasonal_mult = 1.1
-    else:  # Fall - moderate
-        seasonal_mult = 1.2
+    # Seasonal patterns for diabetes medication (higher in winter months), per calendar month Jan..Dec
+    seasonal_by_month = np.array([1.6, 1.6, 1.1, 1.1, 1.1, 0.8, 0.8, 0.8, 1.2, 1.2, 1.2, 1.6])
+    seasonal_mult = seasonal_by_month[days.month.to_numpy() - 1]
     
-    # Weekday patterns (more variation for better patterns)
-    weekday = current_date.weekday()
-    if weekday == 6:  # Sunday
-        weekday_mult = 0.6
-    elif weekday == 5:  # Saturday
-        weekday_mult = 0.9
-    elif weekday in [0, 1, 2, 3, 4]:  # Weekdays
-        weekday_mult = 1.3
-    else:
-        weekday_mult = 1.0
+    # Weekday patterns (more variation for better patterns), Mon..Sun
+    weekday_by_day = np.array([1.3, 1.3, 1.3, 1.3, 1.3, 0.9, 0.6])
+    weekday_mult = weekday_by_day[days.weekday.to_numpy()]
     
     # Growth trend (more realistic business growth for diabetes medication)
-    years_elapsed = (current_date - start_date).days / 365.25
+    years_elapsed = (days - days[0]).days.to_numpy() / 365.25
     growth_factor = (1 + 0.14) ** years_elapsed  # 14% annual growth (higher than Amoxicillin)
     
     # Random variation (more realistic)
-    random_factor = random.uniform(0.7, 1.3)
+    random_factor = rng.uniform(0.7, 1.3, size=len(days))
     
     # Calculate final sales
-    daily_sales = int(base_sales * seasonal_mult * weekday_mult * growth_factor * random_factor)
+    daily_sales = (base_sales * seasonal_mult * weekday_mult * growth_factor * random_factor).astype(int)
     
     # Ensure minimum sales for data density
-    return max(10, daily_sales)  # Minimum 10 sales per day
+    return np.maximum(10, daily_sales)  # Minimum 10 sales per day
 
 def generate_metformin_ace_optimized():
     print("=== Optimized Metformin Data Generator for Sales Rep 'ace' ===")
@@ -129,29 +154,25 @@ def generate_metformin_ace_optimized():
         return
     print(f"✅ Found sales rep 'ace' (ID: {ace_sales_rep_id})")
 
-    # 3. Clear existing data for medicine 4
-    print("\n🧹 Clearing existing data...")
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("DELETE FROM orders_orderitem WHERE medicine_id = 4")
-            cursor.execute("DELETE FROM orders_orderstatushistory WHERE order_id IN (SELECT id FROM orders_order WHERE sales_rep_id = %s)", [ace_sales_rep_id])
-            cursor.execute("DELETE FROM orders_order WHERE sales_rep_id = %s", [ace_sales_rep_id])
-            cursor.execute("DELETE FROM inventory_stockmovement WHERE medicine_id = 4")
-            print("✅ Cleared existing data")
-    except Exception as e:
-        print(f"⚠️  Error clearing data: {e}")
-
-    # 4. Define optimized date range (2015-2025) - 10 years for maximum accuracy
+    # 3. Define optimized date range (2015-2025) - 10 years for maximum accuracy
     start_date = date(2015, 1, 1)
     end_date = date(2025, 12, 31)
     
-    # 5. Generate optimized orders
-    current_date = start_date
+    # 4. Generate optimized orders
     orders_created = 0
     current_stock = 12000  # Higher initial stock for 10 years
-    stock_movement_id = get_next_stock_movement_id()
     order_counter = 0
     random.seed(42)  # for reproducibility
+    rng = np.random.default_rng(42)
+    max_orders_per_day = 18
+    
+    # Daily sales and per-order quantity draws for the whole range up front
+    # (date strings as plain lists, indexing a pandas Index per order is slow)
+    days = pd.date_range(start_date, end_date, freq='D')
+    day_isos = days.strftime('%Y-%m-%d').tolist()
+    day_stamps = days.strftime('%Y%m%d').tolist()
+    daily_sales_arr = calculate_optimized_daily_sales(days, rng)
+    order_qty_draws = rng.integers(1, 11, size=(len(days), max_orders_per_day))
 
     print(f"\n📅 Generating optimized orders from {start_date} to {end_date}")
     print(f"   Target: ~36,500+ daily data points for maximum accuracy")
@@ -162,14 +183,56 @@ def generate_metformin_ace_optimized():
     try:
         conn = sqlite3.connect(db_path, timeout=30.0)
         cursor = conn.cursor()
+        # Seed run: skip fsyncs and keep temp data in memory, everything commits once at the end
+        # foreign_keys matches Django's sqlite connection, so the deletes below are checked as before
+        conn.executescript("PRAGMA foreign_keys=ON; PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-200000;")
+        conn.execute("BEGIN IMMEDIATE")
+        
+        # Clear existing data for medicine 4 in the same transaction as the new rows
+        print("\n🧹 Clearing existing data...")
+        try:
+            cursor.execute("DELETE FROM orders_orderitem WHERE medicine_id = 4")
+            # Only orders left without items, ace orders for other medicines stay referenced
+            empty_orders = "SELECT id FROM orders_order o WHERE sales_rep_id = ? AND NOT EXISTS (SELECT 1 FROM orders_orderitem i WHERE i.order_id = o.id)"
+            cursor.execute(f"DELETE FROM orders_orderstatushistory WHERE order_id IN ({empty_orders})", [ace_sales_rep_id])
+            cursor.execute(f"DELETE FROM orders_order WHERE id IN ({empty_orders})", [ace_sales_rep_id])
+            cursor.execute("DELETE FROM inventory_stockmovement WHERE medicine_id = 4")
+            print("✅ Cleared existing data")
+        except sqlite3.Error as e:
+            print(f"⚠️  Error clearing data: {e}")
+        
+        # Rebuilding an index re-sorts the whole table, which only beats per-row updates when
+        # nothing else is left in it. Index DDL is transactional in SQLite, a failed run rolls
+        # the drop back as well. Unique indexes stay so order numbers are still enforced.
+        index_sql = []
+        cursor.execute("SELECT EXISTS(SELECT 1 FROM orders_order)")
+        if not cursor.fetchone()[0]:
+            index_sql = drop_secondary_indexes(cursor, BULK_LOAD_TABLES)
         
         print(f"📊 Starting optimized data generation...")
         print(f"   Database: {db_path}")
         print(f"   Sales rep: ace (ID: {ace_sales_rep_id})")
         
-        while current_date <= end_date:
-            # Calculate optimized daily sales
-            daily_sales = calculate_optimized_daily_sales(current_date, start_date)
+        # Order and stock movement ids are assigned here instead of read back through lastrowid,
+        # inside the write transaction and after the clear so no other writer can take them
+        cursor.execute("SELECT MAX(id) FROM orders_order")
+        next_order_id = (cursor.fetchone()[0] or 0) + 1
+        cursor.execute("SELECT MAX(id) FROM inventory_stockmovement")
+        stock_movement_id = (cursor.fetchone()[0] or 0) + 1
+        order_rows = []
+        order_item_rows = []
+        status_history_rows = []
+        stock_movement_rows = []
+        # Orders go first so items and history never reference a missing order
+        batches = (
+            (ORDER_INSERT_SQL, order_rows),
+            (ORDER_ITEM_INSERT_SQL, order_item_rows),
+            (STATUS_HISTORY_INSERT_SQL, status_history_rows),
+            (STOCK_MOVEMENT_INSERT_SQL, stock_movement_rows),
+        )
+        
+        for day_index, current_date in enumerate(days.date):
+            daily_sales = int(daily_sales_arr[day_index])
             
             # Check if we need to reorder (more frequent reorders for realism)
             if current_stock < daily_sales and current_stock <= 500:
@@ -177,31 +240,27 @@ def generate_metformin_ace_optimized():
                 current_stock += reorder_qty
                 
                 # Create stock movement for reorder
-                cursor.execute("""
-                    INSERT INTO inventory_stockmovement 
-                    (id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                stock_movement_rows.append((
                     stock_movement_id,
                     4,  # Metformin ID
                     'in',
                     reorder_qty,
-                    f"ACE-REORDER-{current_date.strftime('%Y%m%d')}",
+                    f"ACE-REORDER-{day_stamps[day_index]}",
                     f"Reorder by ace - stock below reorder point",
                     ace_sales_rep_id,
-                    current_date.isoformat()
+                    day_isos[day_index]
                 ))
                 stock_movement_id += 1
             
             # Create optimized orders for the day (more orders per day)
-            orders_today = min(max(3, daily_sales // 3), 18)  # 3-18 orders per day
+            orders_today = min(max(3, daily_sales // 3), max_orders_per_day)  # 3-18 orders per day
             remaining_sales = daily_sales
             
             for order_num in range(orders_today):
                 if remaining_sales <= 0 or current_stock <= 0:
                     break
                 
-                order_qty = min(random.randint(1, 10), remaining_sales, current_stock)  # Larger quantities
+                order_qty = min(int(order_qty_draws[day_index, order_num]), remaining_sales, current_stock)  # Larger quantities
                 if order_qty <= 0:
                     break
                 
@@ -212,18 +271,13 @@ def generate_metformin_ace_optimized():
                 
                 # Create order
                 order_counter += 1
-                order_number = f"MET-{current_date.strftime('%Y%m%d')}{order_counter:04d}"
+                order_number = f"MET-{day_stamps[day_index]}{order_counter:04d}"
                 
                 # Create order record (ace creates order with customer details)
-                cursor.execute("""
-                    INSERT INTO orders_order 
-                    (order_number, sales_rep_id, customer_name, customer_phone, customer_address, 
-                     status, payment_status, subtotal, tax_amount, shipping_cost, discount_amount, 
-                     total_amount, delivery_method, delivery_address, delivery_instructions, 
-                     prescription_required, prescription_verified, customer_notes, internal_notes, 
-                     created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                order_id = next_order_id
+                next_order_id += 1
+                order_rows.append((
+                    order_id,
                     order_number,
                     ace_sales_rep_id,
                     f"Customer-{order_counter:08d}",  # ace assigned customer name
@@ -243,35 +297,23 @@ def generate_metformin_ace_optimized():
                     True,   # prescription_verified
                     f"Customer notes for order {order_number}",  # customer_notes
                     f"Order created by ace - {order_number}",  # internal_notes
-                    current_date.isoformat(),
-                    current_date.isoformat()
+                    day_isos[day_index],
+                    day_isos[day_index]
                 ))
                 
-                order_id = cursor.lastrowid
-                
                 # Create order item
-                cursor.execute("""
-                    INSERT INTO orders_orderitem 
-                    (order_id, medicine_id, quantity, unit_price, total_price, 
-                     prescription_notes, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+                order_item_rows.append((
                     order_id,
                     4,  # Metformin ID
                     order_qty,
                     float(metformin.unit_price),
                     order_qty * float(metformin.unit_price),
                     f"Prescription for {metformin.name} - processed by ace",
-                    current_date.isoformat()
+                    day_isos[day_index]
                 ))
                 
                 # Create order status history
-                cursor.execute("""
-                    INSERT INTO orders_orderstatushistory 
-                    (order_id, old_status, new_status, old_payment_status, new_payment_status, 
-                     notes, changed_by_id, changed_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                status_history_rows.append((
                     order_id,
                     'pending',  # old_status
                     'delivered',  # new_status
@@ -279,7 +321,7 @@ def generate_metformin_ace_optimized():
                     'paid',  # new_payment_status
                     'Order completed successfully by ace',
                     ace_sales_rep_id,
-                    current_date.isoformat()
+                    day_isos[day_index]
                 ))
                 
                 # Update stock
@@ -288,11 +330,7 @@ def generate_metformin_ace_optimized():
                 orders_created += 1
                 
                 # Create stock movement for sale
-                cursor.execute("""
-                    INSERT INTO inventory_stockmovement 
-                    (id, medicine_id, movement_type, quantity, reference_number, notes, created_by_id, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                stock_movement_rows.append((
                     stock_movement_id,
                     4,  # Metformin ID
                     'out',
@@ -300,7 +338,7 @@ def generate_metformin_ace_optimized():
                     order_number,
                     f"Sale by ace - Order {order_number}",
                     ace_sales_rep_id,
-                    current_date.isoformat()
+                    day_isos[day_index]
                 ))
                 stock_movement_id += 1
             
@@ -308,11 +346,18 @@ def generate_metformin_ace_optimized():
             if orders_created > 60000:
                 break
             
+            if len(order_rows) >= BATCH_SIZE:
+                flush_batches(cursor, batches)
+            
             # Progress reporting (monthly)
             if current_date.day == 1:  # Monthly progress
                 print(f"  📅 {current_date.strftime('%Y-%m')}: {orders_created} orders, Stock: {current_stock}")
-            
-            current_date += timedelta(days=1)
+        
+        flush_batches(cursor, batches)
+        
+        # Rebuild any dropped indexes in one pass each
+        for sql in index_sql:
+            cursor.execute(sql)
         
         # Update medicine stock
         cursor.execute("""
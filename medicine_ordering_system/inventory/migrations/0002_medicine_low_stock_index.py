@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medicine',
+            index=models.Index(fields=['is_active', 'current_stock', 'reorder_point'], name='inventory_m_is_acti_fc3654_idx'),
+        ),
+    ]
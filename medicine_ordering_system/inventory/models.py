@@ -93,6 +93,7 @@ class Medicine(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['category']),
             models.Index(fields=['is_active', 'is_available']),
+            models.Index(fields=['is_active', 'current_stock', 'reorder_point']),
         ]
     
     def __str__(self):
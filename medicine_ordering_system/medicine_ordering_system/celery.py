@@ -0,0 +1,17 @@
+"""
+Celery application for running background tasks such as ARIMA forecasting
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'medicine_ordering_system.settings')
+
+app = Celery('medicine_ordering_system')
+
+# Read CELERY_* settings from Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Load tasks.py modules from all installed apps
+app.autodiscover_tasks()
@@ -99,6 +99,8 @@ WSGI_APPLICATION = 'medicine_ordering_system.wsgi.application'
 #         'PASSWORD': 'password',
 #         'HOST': 'localhost',
 #         'PORT': '3306',
+#         'CONN_MAX_AGE': 600,
+#         'CONN_HEALTH_CHECKS': True,
 #         'OPTIONS': {
 #             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
 #         },
@@ -109,6 +111,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests, the analytics pages run many small queries
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -121,6 +126,8 @@ DATABASES = {
 #         'PASSWORD': '',               # Default XAMPP MySQL password (usually empty)
 #         'HOST': 'localhost',
 #         'PORT': '3306',
+#         'CONN_MAX_AGE': 600,
+#         'CONN_HEALTH_CHECKS': True,
 #         'OPTIONS': {
 #             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
 #         }
@@ -195,6 +202,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'EXCEPTION_HANDLER': 'common.exceptions.api_exception_handler',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
@@ -205,6 +217,18 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 
+# Forecasting
+# Backend for bulk forecasts: 'statsmodels' fits each medicine separately,
+# 'statsforecast' batch-fits all series in one call (requires statsforecast)
+FORECAST_BATCH_BACKEND = 'statsmodels'
+# ARIMA order search: 'pmdarima' (auto_arima) or 'statsforecast' (Numba-compiled
+# AutoARIMA, opt-in, requires statsforecast and falls back to pmdarima without it)
+FORECAST_ORDER_BACKEND = 'pmdarima'
+# Worker processes for per-medicine bulk fits with the statsmodels backend.
+# 1 fits sequentially in the calling process, higher values fork a process
+# pool per bulk run, so keep it at 1 for web and Celery workers
+FORECAST_BULK_WORKERS = 1
+
 # Celery Configuration
 CELERY_BROKER_URL = 'redis://localhost:6379'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379'
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from decimal import Decimal
@@ -96,47 +97,59 @@ class Order(models.Model):
     
     def decrease_stock(self):
         """Decrease stock for all items in this order"""
-        from inventory.models import StockMovement
-        from django.utils import timezone
+        from inventory.models import Medicine, StockMovement
         
-        for item in self.items.all():
+        # Only medicine ids and quantities are needed, stock is adjusted in the database
+        items = list(self.items.only('order', 'medicine', 'quantity'))
+        now = timezone.now()
+        for item in items:
             # Decrease the medicine's current stock
-            item.medicine.current_stock -= item.quantity
-            item.medicine.save()
-            
-            # Create stock movement record
-            StockMovement.objects.create(
-                medicine=item.medicine,
+            Medicine.objects.filter(pk=item.medicine_id).update(
+                current_stock=F('current_stock') - item.quantity, updated_at=now
+            )
+        
+        # Create stock movement records
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                medicine_id=item.medicine_id,
                 movement_type='out',
                 quantity=-item.quantity,  # Negative for stock out
                 reference_number=self.order_number,
                 notes=f'Order {self.order_number} - {item.quantity} units sold',
-                created_by=self.sales_rep
+                created_by_id=self.sales_rep_id
             )
+            for item in items
+        ])
     
     def restore_stock(self):
         """Restore stock for all items in this order (for cancellations)"""
-        from inventory.models import StockMovement
-        from django.utils import timezone
+        from inventory.models import Medicine, StockMovement
         
-        for item in self.items.all():
+        # Only medicine ids and quantities are needed, stock is adjusted in the database
+        items = list(self.items.only('order', 'medicine', 'quantity'))
+        now = timezone.now()
+        for item in items:
             # Restore the medicine's current stock
-            item.medicine.current_stock += item.quantity
-            item.medicine.save()
-            
-            # Create stock movement record
-            StockMovement.objects.create(
-                medicine=item.medicine,
+            Medicine.objects.filter(pk=item.medicine_id).update(
+                current_stock=F('current_stock') + item.quantity, updated_at=now
+            )
+        
+        # Create stock movement records
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                medicine_id=item.medicine_id,
                 movement_type='return',
                 quantity=item.quantity,  # Positive for stock return
                 reference_number=f"{self.order_number}-CANCEL",
                 notes=f'Order {self.order_number} cancelled - {item.quantity} units restored',
-                created_by=self.sales_rep
+                created_by_id=self.sales_rep_id
             )
+            for item in items
+        ])
     
     def check_stock_availability(self):
         """Check if all items in the order have sufficient stock"""
-        for item in self.items.all():
+        for item in self.items.select_related('medicine'):
             if item.medicine.current_stock < item.quantity:
                 return False, f"Insufficient stock for {item.medicine.name}. Available: {item.medicine.current_stock}, Required: {item.quantity}"
         return True, "Stock available"
@@ -20,11 +20,12 @@ def test_forecast_only_data():
     
     # Check if we have forecasts
     forecasts = DemandForecast.objects.filter(is_active=True)
-    print(f"Total active forecasts: {forecasts.count()}")
+    total_forecasts = forecasts.count()
+    print(f"Total active forecasts: {total_forecasts}")
     
-    if forecasts.exists():
-        # Check medicines with forecasts
-        medicine_ids = set(forecasts.values_list('medicine_id', flat=True))
+    if total_forecasts:
+        # Check medicines with forecasts (DISTINCT in SQL, without the default ordering)
+        medicine_ids = list(forecasts.order_by().values_list('medicine_id', flat=True).distinct())
         print(f"Medicines with forecasts: {medicine_ids}")
         
         for medicine_id in medicine_ids: